@@ -2,20 +2,82 @@
 
 """ Functions to get table and light curves data using astroquery. """
 
+import concurrent.futures
+import hashlib
 import logging
 import os
+import re
+import tempfile
+import threading
+import time
 import warnings
+from collections import OrderedDict
+from pathlib import Path
 
+import astropy.units as u
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+import requests
+from astropy.table import Column
+from requests.adapters import HTTPAdapter
 from astroquery.nasa_exoplanet_archive import NasaExoplanetArchive
 from lightkurve import search_lightcurvefile
 from lightkurve.utils import LightkurveWarning
 from tqdm import tqdm
 
-from exoplanets.default_data_params import DEFAULT_PARAMS
+from exoplanets.default_data_params import (
+    CATEGORICAL_COLUMNS,
+    DEFAULT_PARAMS,
+    STRING_COLUMNS,
+)
 
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "exoplanets",
+)
+CACHE_TTL = 7 * 24 * 3600
+MEMORY_CACHE_SIZE = 16
+CHUNK_ROWS = 500_000
+MAX_WORKERS = 8
+KEPID_BATCH_SIZE = 500
+CSV_BLOCK_SIZE = 1 << 20
+STREAM_BLOCK_SIZE = 1 << 22
+TAP_URL = "https://exoplanetarchive.ipac.caltech.edu/TAP/sync"
+TAP_TIMEOUT = 600
+FILE_FORMATS = {
+    ".parquet": "parquet",
+    ".h5": "hdf",
+    ".hdf5": "hdf",
+    ".feather": "feather",
+    ".arrow": "arrow",
+}
 
-def read_kepler_data(table, columns=None, where=None, filename=None):
+_KEPID_RE = re.compile(r"^\s*kepid\s*=\s*(\d+)\s*$")
+_KEPID_FILTER_RE = re.compile(
+    r"^\s*kepid\s*(=\s*\d+|in\s*\(\s*\d+(\s*,\s*\d+)*\s*\))\s*$", re.IGNORECASE
+)
+
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=MAX_WORKERS))
+
+_memory_cache = OrderedDict()
+_memory_cache_lock = threading.Lock()
+
+
+def read_kepler_data(
+    table,
+    columns=None,
+    where=None,
+    filename=None,
+    cache=True,
+    stream=False,
+    projection=None,
+    backend="tap",
+):
     """ Returns a pandas DataFrame containing the requested data from the
         NasaExoplanetArchive API described in [1].
 
@@ -36,28 +98,209 @@ def read_kepler_data(table, columns=None, where=None, filename=None):
             'where' filter for the table is used if defined in DEFAULT_PARAMS,
             else no filter is applied.
         :param str filename:
-            If a filename is provided, the pandas DataFrame is saved in .csv format if
-            the file does not exist, and is directly read from the file if it already
-            exists.
+            If a filename is provided, the pandas DataFrame is saved into the file if
+            it does not exist, and is directly read from the file if it already exists.
+            The file format is chosen from the extension of the filename (.parquet,
+            .h5, .feather, .arrow or .csv, see record_dataframe).
+        :param bool cache:
+            If no filename is provided and cache is True, the query results are stored
+            in CACHE_DIR and identical queries are read back from there for CACHE_TTL
+            seconds instead of querying the NasaExoplanetArchive API again.
+        :param bool stream:
+            If True, an iterator of pandas DataFrames of about CHUNK_ROWS rows is
+            returned instead of a single DataFrame (see iter_kepler_data).
+        :param list projection:
+            The list of the names of the columns in the table which are actually
+            needed (e.g. projection=["kepid", "teff"]). If provided, only these
+            columns are pulled from the table (or read from the file), and are
+            still renamed if columns is a dictionary.
+        :param str backend:
+            The way the table is queried: "tap" reads the .csv response of the TAP
+            service of the NasaExoplanetArchive directly into pandas, "astropy" goes
+            through astroquery and an astropy table.
 
         :returns pandas.DataFrame:
-            The pandas DataFrame containing the requested NasaExoplanetArchive table.
+            The pandas DataFrame containing the requested NasaExoplanetArchive table,
+            or an iterator of pandas DataFrames if stream is True.
 
         [1]: https://exoplanetarchive.ipac.caltech.edu/docs/program_interfaces.html
     """
+    if stream:
+        return iter_kepler_data(
+            table,
+            columns,
+            where,
+            filename,
+            cache=cache,
+            chunksize=CHUNK_ROWS,
+            projection=projection,
+            backend=backend,
+        )
     columns, where = get_default_params(table, columns, where)
-    if not filename or not os.path.isfile(filename):
-        logging.info("Reading Kepler data from table {}".format(table))
-        kepler_data = get_kepler_data(table, columns, where)
-        df = kepler_data.to_pandas()
+    columns = project_columns(columns, projection)
+    file_columns = get_renamed_columns(columns) if projection else None
+    if not filename or not Path(filename).is_file():
+        df = query_kepler_data(
+            table, columns, where, cache=cache and not filename, backend=backend
+        )
         df = rename_columns(df, columns)
         record_dataframe(df, filename)
     else:
         logging.info("Reading Kepler data from {}".format(filename))
-        df = pd.read_csv(filename)
+        df = read_dataframe(filename, columns=file_columns)
     return df
 
 
+def iter_kepler_data(
+    table,
+    columns=None,
+    where=None,
+    filename=None,
+    cache=True,
+    chunksize=100_000,
+    projection=None,
+    backend="tap",
+):
+    """ Iterates over the requested data from the NasaExoplanetArchive API by pandas
+        DataFrames of about chunksize rows, so that the first rows can be processed
+        while the next ones are downloaded, and the whole table is never loaded in
+        memory. The parameters are the same as for read_kepler_data.
+
+        Existing files (see iter_dataframe) and cached queries are read by chunks.
+        Otherwise, the .csv response of the TAP service is parsed block by block
+        while it is downloaded (see iter_tap_data); these results are not cached. If
+        a filename is provided but does not exist, or if the astropy backend is
+        used, the data is first fully read with read_kepler_data.
+
+        :param int chunksize:
+            The number of rows in each DataFrame.
+
+        :returns iterator:
+            An iterator of pandas DataFrames.
+    """
+    columns, where = get_default_params(table, columns, where)
+    columns = project_columns(columns, projection)
+    if filename and Path(filename).is_file():
+        logging.info("Reading Kepler data from {}".format(filename))
+        file_columns = get_renamed_columns(columns) if projection else None
+        yield from iter_dataframe(filename, chunksize, columns=file_columns)
+        return
+    df = None
+    if cache and not filename:
+        df = read_memory_cache(get_cache_key(table, columns, where, backend))
+        if df is None:
+            df = read_cache(get_cache_filename(table, columns, where, backend))
+    if df is not None:
+        chunks = iter_chunks(df, chunksize)
+    elif filename or backend != "tap":
+        df = read_kepler_data(table, columns, where, filename, cache, backend=backend)
+        yield from iter_chunks(df, chunksize)
+        return
+    else:
+        chunks = iter_tap_data(table, columns, where, chunksize)
+    for chunk in chunks:
+        yield rename_columns(chunk, columns)
+
+
+def iter_chunks(df, chunksize):
+    """ Iterates over a pandas DataFrame by chunks of rows.
+
+        :param pandas.DataFrame df:
+            The pandas DataFrame to split.
+        :param int chunksize:
+            The number of rows in each chunk.
+
+        :returns iterator:
+            An iterator of pandas DataFrames, with a single empty DataFrame if df is
+            empty.
+    """
+    for i in range(0, max(len(df), 1), chunksize):
+        yield df.iloc[i : i + chunksize]
+
+
+def read_many_kepler_data(specs):
+    """ Returns the pandas DataFrames for several NasaExoplanetArchive tables. The
+        queries are run concurrently in a thread pool, so the total time is close to
+        the time of the slowest query rather than the sum of all query times. With
+        the default "tap" backend, all threads share the module-level HTTP session
+        of get_tap_data, and with the "astropy" backend, the HTTP session of the
+        NasaExoplanetArchive object.
+
+        :param list specs:
+            The list of queries, each being a dictionary of keyword arguments for
+            read_kepler_data (e.g. [{"table": "cumulative"},
+            {"table": "q1_q17_dr25_stellar", "where": "kepid=12345"}]).
+
+        :returns dict:
+            A dictionary mapping the table name of each query to its pandas
+            DataFrame.
+
+        :raises ValueError:
+            If several queries are on the same table.
+    """
+    tables = [spec["table"] for spec in specs]
+    duplicates = sorted({table for table in tables if tables.count(table) > 1})
+    if duplicates:
+        raise ValueError("Several queries on the tables {}".format(duplicates))
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max(1, min(MAX_WORKERS, len(specs)))
+    ) as executor:
+        futures = {
+            spec["table"]: executor.submit(read_kepler_data, **spec) for spec in specs
+        }
+        return {table: future.result() for table, future in futures.items()}
+
+
+def get_kepler_data_many(
+    kepids,
+    table="q1_q17_dr25_stellar",
+    columns=None,
+    batch_size=KEPID_BATCH_SIZE,
+    cache=True,
+    backend="tap",
+):
+    """ Returns a pandas DataFrame containing the data of several targets, using one
+        "kepid in (...)" query per batch of targets instead of one query per target.
+
+        :param list kepids:
+            The list of targets IDs (kepid).
+        :param str table:
+            The name of the table in the NasaExoplanetArchive API.
+        :type columns: list or dict
+        :param columns:
+            The columns to read from the table (see read_kepler_data). The kepid
+            column is always read.
+        :param int batch_size:
+            The maximum number of targets in each query, to bound the length of the
+            query.
+        :param bool cache:
+            Whether to use the in-memory and on-disk caches (see query_kepler_data).
+        :param str backend:
+            The way the table is queried (see read_kepler_data).
+
+        :returns pandas.DataFrame:
+            The pandas DataFrame containing the requested data, indexed by kepid. It
+            is empty, without querying the table, if kepids is empty.
+    """
+    columns, _ = get_default_params(table, columns, None)
+    if "kepid" not in columns and "*" not in columns:
+        if isinstance(columns, dict):
+            columns = {"kepid": "kepid", **columns}
+        else:
+            columns = ["kepid"] + list(columns)
+    kepids = list(dict.fromkeys(int(kepid) for kepid in kepids))
+    if not kepids:
+        names = [col for col in columns if col not in ("kepid", "*")]
+        df = pd.DataFrame(columns=names, index=pd.Index([], name="kepid"))
+        return rename_columns(df, columns)
+    dfs = []
+    for i in range(0, len(kepids), batch_size):
+        where = "kepid in ({})".format(",".join(map(str, kepids[i : i + batch_size])))
+        dfs.append(query_kepler_data(table, columns, where, cache, backend))
+    df = pd.concat(dfs, ignore_index=True).set_index("kepid")
+    return rename_columns(df, columns)
+
+
 def get_default_params(table, columns, where):
     """ Returns the default columns and where parameters for the table if specified in
         DEFAULT_PARAMS and if 'columns' and/or 'where' are None.
@@ -79,6 +322,485 @@ def get_default_params(table, columns, where):
     return columns, where
 
 
+def project_columns(columns, projection):
+    """ Restricts the columns to read from the table to those in the projection.
+
+        :type columns: list or dict
+        :param columns:
+            The columns to read from the table.
+        :param list projection:
+            The names of the columns in the table to keep, or None to keep all
+            columns.
+
+        :returns list or dict:
+            The projected columns, of the same type as 'columns'. If all columns
+            were selected (columns=["*"]), the projection itself is returned.
+    """
+    if not projection:
+        return columns
+    if isinstance(columns, dict):
+        return {k: v for k, v in columns.items() if k in projection}
+    if list(columns) == ["*"]:
+        return list(projection)
+    return [col for col in columns if col in projection]
+
+
+def get_renamed_columns(columns):
+    """ Returns the names of the columns once renamed by rename_columns.
+
+        :type columns: list or dict
+        :param columns:
+            The columns read from the table.
+
+        :returns list:
+            The list of column names in the renamed pandas DataFrame.
+    """
+    if isinstance(columns, dict):
+        return list(columns.values())
+    return list(columns)
+
+
+def query_kepler_data(table, columns, where, cache=True, backend="tap"):
+    """ Returns a pandas DataFrame containing the requested data from the
+        NasaExoplanetArchive API, with the original column names of the table.
+
+        :param str table:
+            The name of the table in the NasaExoplanetArchive API.
+        :type columns: list or dict
+        :param columns:
+            The columns to read from the table.
+        :param str where:
+            The 'where' filter to apply to the table.
+        :param bool cache:
+            Whether to read the results from (and write them to) the in-memory and
+            on-disk caches.
+        :param str backend:
+            "tap" to use get_tap_data, or "astropy" to use get_kepler_data.
+
+        :returns pandas.DataFrame:
+            The pandas DataFrame containing the requested data.
+    """
+    key = get_cache_key(table, columns, where, backend)
+    if cache:
+        df = read_memory_cache(key)
+        if df is None and where and _KEPID_RE.match(where):
+            kepid = int(_KEPID_RE.match(where).group(1))
+            df = read_memory_cache_kepid(table, columns, kepid, backend)
+        if df is not None:
+            return df
+    cache_filename = None
+    if cache:
+        cache_filename = get_cache_filename(table, columns, where, backend)
+    df = read_cache(cache_filename)
+    if df is None:
+        logging.info("Reading Kepler data from table {}".format(table))
+        if backend == "tap":
+            df = get_tap_data(table, columns, where)
+        elif backend == "astropy":
+            df = table_to_pandas(get_kepler_data(table, columns, where))
+        else:
+            raise ValueError("Unknown backend '{}'".format(backend))
+        df = categorize_columns(df)
+        record_cache(df, cache_filename)
+    if cache:
+        record_memory_cache(key, df, table, where, backend)
+    return df
+
+
+def table_to_pandas(kepler_data):
+    """ Converts an astropy table into a pandas DataFrame by passing the column
+        buffers directly to pandas, which is about 3 times faster than
+        astropy.table.Table.to_pandas. The masked values are replaced by NaN, and the
+        masked integer columns are converted to floats like in the .csv data of the
+        TAP service. Tables with other kinds of columns (e.g. Time or
+        multidimensional columns) are converted with to_pandas.
+
+        :param astropy.table.QTable kepler_data:
+            The astropy table to convert.
+
+        :returns pandas.DataFrame:
+            The pandas DataFrame containing the table data.
+    """
+    data = {}
+    for name in kepler_data.colnames:
+        col = kepler_data[name]
+        if not isinstance(col, (Column, u.Quantity)) or col.ndim != 1:
+            return kepler_data.to_pandas()
+        mask = getattr(col, "mask", None)
+        values = np.asarray(col.unmasked if hasattr(col, "unmasked") else col)
+        if values.dtype.byteorder == ">":
+            values = values.astype(values.dtype.newbyteorder("="))
+        if values.dtype.kind in "SU":
+            values = values.astype(object)
+        if mask is not None and np.any(mask):
+            values = values.astype(float if values.dtype.kind in "iubf" else object)
+            values[np.asarray(mask)] = np.nan
+        data[name] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def categorize_columns(df):
+    """ Converts the low cardinality string columns listed in CATEGORICAL_COLUMNS to
+        the pandas category dtype, which stores each distinct value only once.
+
+        :param pandas.DataFrame df:
+            A pandas DataFrame with the original column names of the table.
+
+        :returns pandas.DataFrame:
+            The pandas DataFrame with categorical columns.
+    """
+    for col in df.columns:
+        if col in CATEGORICAL_COLUMNS:
+            df[col] = df[col].astype("category")
+    return df
+
+
+def get_cache_key(table, columns, where, backend="tap"):
+    """ Returns the key of a query in the in-memory and on-disk caches. Only the names
+        of the columns pulled from the table are part of the key, so queries which
+        only differ by the renaming of the columns share the same cached data. The
+        backend is part of the key since the backends may return different dtypes.
+
+        :param str table:
+            The name of the table.
+        :type columns: list or dict
+        :param columns:
+            The columns to read from the table.
+        :param str where:
+            The 'where' filter to apply to the table.
+        :param str backend:
+            The way the table is queried (see read_kepler_data).
+
+        :returns str:
+            The sha1 hash of the query.
+    """
+    query = (table, tuple(columns), where, backend)
+    return hashlib.sha1(repr(query).encode()).hexdigest()
+
+
+def read_memory_cache(key):
+    """ Returns a copy of the pandas DataFrame stored in the in-memory cache for a
+        query if it is more recent than CACHE_TTL seconds.
+
+        :param str key:
+            The cache key of the query.
+
+        :returns pandas.DataFrame:
+            The cached pandas DataFrame, or None if the query is not cached.
+    """
+    with _memory_cache_lock:
+        if key not in _memory_cache:
+            return None
+        timestamp, _, _, _, df = _memory_cache[key]
+        if time.time() - timestamp > CACHE_TTL:
+            del _memory_cache[key]
+            return None
+        _memory_cache.move_to_end(key)
+    logging.info("Reading Kepler data from memory cache")
+    return df.copy()
+
+
+def read_memory_cache_kepid(table, columns, kepid, backend="tap"):
+    """ Returns the rows of a single target from the pandas DataFrames stored in the
+        in-memory cache for other queries on the same table. This serves the
+        where="kepid=<kepid>" queries from previously fetched data, as long as a
+        cached DataFrame contains the target and all the requested columns. Only
+        the queries without a filter or with a plain kepid filter (e.g.
+        "kepid in (1,2)") are used, since the other filters may have dropped some
+        rows of the target (e.g. some of its KOIs in the cumulative table).
+
+        :param str table:
+            The name of the table.
+        :type columns: list or dict
+        :param columns:
+            The columns to read from the table.
+        :param int kepid:
+            The Kepler ID of the target.
+        :param str backend:
+            The way the table is queried, only the queries with the same backend
+            are used.
+
+        :returns pandas.DataFrame:
+            The rows of the target, or None if no cached DataFrame contains it.
+    """
+    columns = list(columns)
+    if columns == ["*"]:
+        return None
+    with _memory_cache_lock:
+        cached = list(_memory_cache.values())
+    for timestamp, cached_table, cached_where, cached_backend, df in reversed(cached):
+        if cached_table != table or cached_backend != backend:
+            continue
+        if time.time() - timestamp > CACHE_TTL:
+            continue
+        if cached_where and not _KEPID_FILTER_RE.match(cached_where):
+            continue
+        if "kepid" not in df.columns or not set(columns) <= set(df.columns):
+            continue
+        rows = df.loc[df["kepid"] == kepid, columns]
+        if len(rows):
+            logging.info("Reading Kepler data for kepid {} from cache".format(kepid))
+            return rows.reset_index(drop=True)
+    return None
+
+
+def record_memory_cache(key, df, table=None, where=None, backend="tap"):
+    """ Stores a copy of the pandas DataFrame in the in-memory cache, evicting the
+        least recently used queries beyond MEMORY_CACHE_SIZE entries.
+
+        :param str key:
+            The cache key of the query.
+        :param pandas.DataFrame df:
+            The pandas DataFrame to cache.
+        :param str table:
+            The name of the queried table, used by read_memory_cache_kepid.
+        :param str where:
+            The 'where' filter of the query, used by read_memory_cache_kepid.
+        :param str backend:
+            The backend of the query, used by read_memory_cache_kepid.
+    """
+    with _memory_cache_lock:
+        _memory_cache[key] = (time.time(), table, where, backend, df.copy())
+        _memory_cache.move_to_end(key)
+        while len(_memory_cache) > MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+
+
+def clear_cache():
+    """ Empties the in-memory cache of the NasaExoplanetArchive queries. """
+    with _memory_cache_lock:
+        _memory_cache.clear()
+
+
+def get_cache_filename(table, columns, where, backend="tap"):
+    """ Returns the location of the on-disk cache file for a query (see
+        get_cache_key).
+
+        :param str table:
+            The name of the table.
+        :type columns: list or dict
+        :param columns:
+            The columns to read from the table.
+        :param str where:
+            The 'where' filter to apply to the table.
+        :param str backend:
+            The way the table is queried (see read_kepler_data).
+
+        :returns str:
+            The location of the .parquet cache file in CACHE_DIR.
+    """
+    key = get_cache_key(table, columns, where, backend)
+    return os.path.join(CACHE_DIR, "{}.parquet".format(key))
+
+
+def read_cache(cache_filename):
+    """ Reads a pandas DataFrame from the on-disk cache if the cache file exists and
+        is more recent than CACHE_TTL seconds.
+
+        :param str cache_filename:
+            The location of the cache file.
+
+        :returns pandas.DataFrame:
+            The cached pandas DataFrame, or None if there is no valid cache file. An
+            unreadable cache file is deleted.
+    """
+    if not cache_filename:
+        return None
+    try:
+        modification_time = Path(cache_filename).stat().st_mtime
+    except OSError:
+        return None
+    if time.time() - modification_time > CACHE_TTL:
+        return None
+    logging.info("Reading Kepler data from cache {}".format(cache_filename))
+    try:
+        return read_dataframe(cache_filename)
+    except (pa.ArrowException, OSError) as error:
+        logging.warning("Deleting invalid cache {}: {}".format(cache_filename, error))
+        try:
+            Path(cache_filename).unlink()
+        except OSError:
+            pass
+        return None
+
+
+def record_cache(df, cache_filename):
+    """ Saves the pandas DataFrame into the on-disk cache. The DataFrame is first
+        written into a temporary file which is then moved to the cache file, so that
+        an interrupted write never leaves a truncated cache file. The cache is only an
+        optimization, so a failure to write it is logged rather than raised.
+
+        :param pandas.DataFrame df:
+            The pandas DataFrame to cache.
+        :param str cache_filename:
+            The location of the cache file, or None to skip the cache.
+    """
+    if not cache_filename:
+        return
+    cache_dir = Path(cache_filename).parent
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_filename = tempfile.mkstemp(suffix=".tmp.parquet", dir=str(cache_dir))
+        os.close(fd)
+        try:
+            record_dataframe(df, tmp_filename)
+            os.replace(tmp_filename, cache_filename)
+        except BaseException:
+            Path(tmp_filename).unlink()
+            raise
+    except (pa.ArrowException, OSError) as error:
+        logging.warning("Cannot write cache {}: {}".format(cache_filename, error))
+
+
+def get_adql_query(table, columns, where):
+    """ Returns the ADQL query for the TAP service of the NasaExoplanetArchive.
+
+        :param str table:
+            The name of the table.
+        :type columns: list or dict
+        :param columns:
+            The columns to read from the table.
+        :param str where:
+            The 'where' filter to apply to the table.
+
+        :returns str:
+            The ADQL query.
+    """
+    query = "select {} from {}".format(",".join(columns), table)
+    if where:
+        query += " where {}".format(where)
+    return query
+
+
+def get_tap_data(table, columns, where):
+    """ Returns a pandas DataFrame containing the requested data from the TAP service
+        of the NasaExoplanetArchive. The .csv response is streamed into the pyarrow
+        csv reader, which parses blocks of CSV_BLOCK_SIZE bytes in background
+        threads while the rest of the response is downloaded, without building an
+        intermediate astropy table. All queries share one HTTP session, so the
+        connections to the Archive are reused.
+
+        :param str table:
+            The name of the table in the NasaExoplanetArchive API.
+        :type columns: list or dict
+        :param columns:
+            The columns to read from the table.
+        :param str where:
+            The 'where' filter to apply to the table.
+
+        :returns pandas.DataFrame:
+            The pandas DataFrame containing the requested data.
+    """
+    params = {"query": get_adql_query(table, columns, where), "format": "csv"}
+    with _session.get(
+        TAP_URL, params=params, stream=True, timeout=TAP_TIMEOUT
+    ) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True
+        table = pacsv.read_csv(
+            response.raw,
+            read_options=pacsv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+            convert_options=get_convert_options(),
+        )
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def get_convert_options():
+    """ Returns the options to convert the .csv data of the TAP service. The columns
+        of STRING_COLUMNS are read as strings instead of guessing their type, and
+        empty strings are read as nulls.
+
+        :returns pyarrow.csv.ConvertOptions:
+            The conversion options of the pyarrow csv readers.
+    """
+    return pacsv.ConvertOptions(
+        column_types={col: pa.string() for col in STRING_COLUMNS},
+        strings_can_be_null=True,
+    )
+
+
+def iter_tap_data(table, columns, where, chunksize):
+    """ Iterates over the requested data from the TAP service of the
+        NasaExoplanetArchive by pandas DataFrames of at least chunksize rows. The .csv
+        response is parsed by blocks of STREAM_BLOCK_SIZE bytes as it is downloaded,
+        and the column types are inferred from the first block. If a later block
+        does not match these types (e.g. a float in a column of integers) before any
+        DataFrame was yielded, the query is sent again and fully read with
+        get_tap_data. Once DataFrames were yielded, the rows of a new query cannot be
+        matched with them since the TAP service does not order the rows, so a
+        ValueError is raised instead.
+
+        :param str table:
+            The name of the table in the NasaExoplanetArchive API.
+        :type columns: list or dict
+        :param columns:
+            The columns to read from the table.
+        :param str where:
+            The 'where' filter to apply to the table.
+        :param int chunksize:
+            The minimum number of rows in each DataFrame, except the last one.
+
+        :returns iterator:
+            An iterator of pandas DataFrames.
+        :raises ValueError:
+            If the column types change after the first DataFrame was yielded.
+    """
+    params = {"query": get_adql_query(table, columns, where), "format": "csv"}
+    with _session.get(
+        TAP_URL, params=params, stream=True, timeout=TAP_TIMEOUT
+    ) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True
+        batches = []
+        n_rows = 0
+        n_chunks = 0
+        n_yielded_rows = 0
+        try:
+            reader = pacsv.open_csv(
+                response.raw,
+                read_options=pacsv.ReadOptions(block_size=STREAM_BLOCK_SIZE),
+                convert_options=get_convert_options(),
+            )
+            for batch in reader:
+                batches.append(batch)
+                n_rows += batch.num_rows
+                if n_rows >= chunksize:
+                    yield batches_to_pandas(batches, reader.schema)
+                    n_yielded_rows += n_rows
+                    batches = []
+                    n_rows = 0
+                    n_chunks += 1
+            if batches or not n_chunks:
+                yield batches_to_pandas(batches, reader.schema)
+            return
+        except pa.ArrowInvalid as error:
+            if n_chunks:
+                raise ValueError(
+                    "The column types of the Kepler data changed after {} rows, use "
+                    "read_kepler_data instead: {}".format(n_yielded_rows, error)
+                ) from error
+            logging.info("Reading Kepler data without streaming: {}".format(error))
+    df = categorize_columns(get_tap_data(table, columns, where))
+    yield from iter_chunks(df, chunksize)
+
+
+def batches_to_pandas(batches, schema):
+    """ Converts pyarrow record batches into a pandas DataFrame with categorical
+        columns (see categorize_columns).
+
+        :param list batches:
+            The list of pyarrow.RecordBatch to convert.
+        :param pyarrow.Schema schema:
+            The schema of the record batches.
+
+        :returns pandas.DataFrame:
+            The pandas DataFrame containing the data of the record batches.
+    """
+    table = pa.Table.from_batches(batches, schema=schema)
+    df = table.to_pandas(split_blocks=True, self_destruct=True)
+    return categorize_columns(df)
+
+
 def get_kepler_data(table, columns, where):
     """ Returns an astropy table containing the requested data from the
         NasaExoplanetArchive API.
@@ -94,8 +816,6 @@ def get_kepler_data(table, columns, where):
         :returns astropy.table.QTable:
             The astropy table containing the requested data.
     """
-    if isinstance(columns, dict):
-        columns = [col for col in columns]
     kepler_data = NasaExoplanetArchive.query_criteria(
         table=table, select=",".join(columns), where=where
     )
@@ -104,7 +824,7 @@ def get_kepler_data(table, columns, where):
 
 def rename_columns(df, columns):
     """ Renames the pandas DataFrame columns if the 'columns' parameters is a
-        dictionary.
+        dictionary. The columns are renamed in place, without copying the DataFrame.
 
         :param pandas.DataFrame df:
             A pandas DataFrame to rename.
@@ -118,23 +838,107 @@ def rename_columns(df, columns):
             The renamed pandas DataFrame.
     """
     if isinstance(columns, dict):
-        df = df.rename(columns=columns)
+        df.columns = [columns.get(col, col) for col in df.columns]
     return df
 
 
+def get_file_format(filename):
+    """ Returns the file format corresponding to the extension of the filename.
+
+        :param str filename:
+            The location of the file.
+
+        :returns str:
+            The file format of the extension in FILE_FORMATS, else "csv".
+    """
+    extension = Path(filename).suffix.lower()
+    return FILE_FORMATS.get(extension, "csv")
+
+
 def record_dataframe(df, filename):
-    """ Saves the pandas DataFrame into a .csv format if a filename is provided.
+    """ Saves the pandas DataFrame into a file if a filename is provided. The format is
+        chosen from the extension of the filename: .parquet files are compressed with
+        zstd, .h5 files are written in the HDF5 table format with blosc:zstd
+        compression (this requires pytables), .feather files are written in the
+        Feather v2 format and .arrow files in the lz4 compressed Arrow IPC format,
+        which are both fast to load from other processes. Any other extension is
+        saved in the .csv format, which is deprecated.
 
         :param pandas.DataFrame df:
-            A pandas DataFrame to save into a .csv format.
+            A pandas DataFrame to save.
         :param str filename:
-            The location in which to save the DataFrame into a .csv format.
+            The location in which to save the DataFrame.
     """
     if filename:
-        path = os.path.dirname(filename)
-        if not os.path.exists(path):
-            os.makedirs(path, exist_ok=True)
-        df.to_csv(filename, index=False)
+        Path(filename).parent.mkdir(parents=True, exist_ok=True)
+        file_format = get_file_format(filename)
+        if file_format == "parquet":
+            df.to_parquet(filename, compression="zstd", index=False)
+        elif file_format == "hdf":
+            df.to_hdf(
+                filename,
+                key="kepler",
+                format="table",
+                complib="blosc:zstd",
+                complevel=5,
+            )
+        elif file_format == "feather":
+            df.to_feather(filename)
+        elif file_format == "arrow":
+            feather.write_feather(df, str(filename), compression="lz4")
+        else:
+            logging.warning(
+                "Saving Kepler data in the .csv format is deprecated, use a .parquet "
+                "filename instead."
+            )
+            df.to_csv(filename, index=False)
+
+
+def read_dataframe(filename, columns=None):
+    """ Reads a pandas DataFrame saved by record_dataframe.
+
+        :param str filename:
+            The location of the file, in one of the formats of record_dataframe.
+        :param list columns:
+            The list of columns to read from the file, or None to read all columns.
+
+        :returns pandas.DataFrame:
+            The pandas DataFrame read from the file.
+    """
+    file_format = get_file_format(filename)
+    if file_format == "parquet":
+        return pd.read_parquet(filename, columns=columns)
+    if file_format == "hdf":
+        return pd.read_hdf(filename, key="kepler", columns=columns)
+    if file_format in ("feather", "arrow"):
+        return pd.read_feather(filename, columns=columns)
+    return pd.concat(iter_dataframe(filename, columns=columns), ignore_index=True)
+
+
+def iter_dataframe(filename, chunksize=CHUNK_ROWS, columns=None):
+    """ Iterates over a pandas DataFrame saved by record_dataframe. The .csv and
+        .parquet files are read by chunks of rows to bound the memory used, the other
+        formats are read in a single DataFrame.
+
+        :param str filename:
+            The location of the file, in one of the formats of record_dataframe.
+        :param int chunksize:
+            The number of rows in each chunk of a .csv or .parquet file.
+        :param list columns:
+            The list of columns to read from the file, or None to read all columns.
+
+        :returns iterator:
+            An iterator of pandas DataFrames.
+    """
+    file_format = get_file_format(filename)
+    if file_format == "csv":
+        yield from pd.read_csv(filename, chunksize=chunksize, usecols=columns)
+    elif file_format == "parquet":
+        parquet_file = pq.ParquetFile(filename)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield read_dataframe(filename, columns=columns)
 
 
 def download_light_curves(targets, dir="./data", prefix="KIC"):
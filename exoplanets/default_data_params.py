@@ -1,6 +1,19 @@
 # -*- coding: utf-8 -*-
 
-""" Default parameters to get table and light curves data using astroquery. """
+""" Default parameters to get table and light curves data using astroquery.
+
+    For each table, "columns" maps the names of the columns pulled from the table to
+    the names of the columns in the returned DataFrame, and "where" is the default
+    filter of the query. A subset of these columns can be pulled with the
+    'projection' parameter of read_kepler_data, which keeps the renaming.
+
+    STRING_COLUMNS lists the string columns of these tables, which are always read
+    as strings from .csv data (e.g. the quarters bit strings, which would else be
+    parsed as numbers and lose their leading zeros, or the vetting dates).
+
+    CATEGORICAL_COLUMNS lists the low cardinality string columns of these tables,
+    which are converted to the pandas category dtype.
+"""
 
 
 DEFAULT_PARAMS = {
@@ -92,3 +105,29 @@ DEFAULT_PARAMS = {
         "where": None,
     },
 }
+
+STRING_COLUMNS = {
+    "tm_designation",
+    "st_quarters",
+    "st_vet_date",
+    "kepoi_name",
+    "kepler_name",
+    "koi_disposition",
+    "koi_quarters",
+    "koi_vet_date",
+    "pl_hostname",
+    "pl_letter",
+    "pl_name",
+    "pl_discmethod",
+    "pl_facility",
+}
+
+CATEGORICAL_COLUMNS = {
+    "st_quarters",
+    "st_vet_date",
+    "koi_disposition",
+    "koi_quarters",
+    "koi_vet_date",
+    "pl_discmethod",
+    "pl_facility",
+}
@@ -2,14 +2,32 @@
 
 """ Tests for exoplanets.astro_data """
 
+import io
 import os
 
 import astropy
 import pandas as pd
+import pytest
 
 from exoplanets import astro_data
 
 
+class FakeResponse:
+    """ A streamed response of the TAP service with the given .csv content. """
+
+    def __init__(self, data):
+        self.raw = io.BytesIO(data)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def raise_for_status(self):
+        pass
+
+
 class TestAstroDataTable:
     def test_get_default_params(self):
         columns, where = astro_data.get_default_params(
@@ -37,10 +55,324 @@ class TestAstroDataTable:
         assert kepler_data.keys() == ["kepid"]
         assert kepler_data["kepid"].tolist() == [8113154]
 
+    def test_get_kepler_data_many(self, monkeypatch):
+        calls = []
+
+        def query_kepler_data(table, columns, where, cache, backend):
+            calls.append((columns, where))
+            kepids = [int(kepid) for kepid in where[10:-1].split(",")]
+            return pd.DataFrame({"kepid": kepids, "teff": [k * 10 for k in kepids]})
+
+        monkeypatch.setattr(astro_data, "query_kepler_data", query_kepler_data)
+        df = astro_data.get_kepler_data_many(
+            [3, 1, 2, 1], columns={"teff": "Teff"}, batch_size=2
+        )
+        assert calls == [
+            ({"kepid": "kepid", "teff": "Teff"}, "kepid in (3,1)"),
+            ({"kepid": "kepid", "teff": "Teff"}, "kepid in (2)"),
+        ]
+        assert df.index.tolist() == [3, 1, 2]
+        assert df.loc[2, "Teff"] == 20
+
+    def test_get_kepler_data_many_empty(self, monkeypatch):
+        def query_kepler_data(table, columns, where, cache, backend):
+            raise AssertionError("No query expected")
+
+        monkeypatch.setattr(astro_data, "query_kepler_data", query_kepler_data)
+        df = astro_data.get_kepler_data_many([], columns=["*"])
+        assert df.empty
+        assert df.index.name == "kepid"
+        df = astro_data.get_kepler_data_many([], columns={"teff": "Teff"})
+        assert df.columns.tolist() == ["Teff"]
+        assert df.index.name == "kepid"
+
+    def test_project_columns(self):
+        columns = {"kepid": "Kepler ID", "teff": "Teff", "mass": "Mass"}
+        assert astro_data.project_columns(columns, None) is columns
+        assert astro_data.project_columns(columns, ["mass", "kepid"]) == {
+            "kepid": "Kepler ID",
+            "mass": "Mass",
+        }
+        assert astro_data.project_columns(["kepid", "teff"], ["teff"]) == ["teff"]
+        assert astro_data.project_columns(["*"], ["teff"]) == ["teff"]
+
+    def test_read_kepler_data_projection(self, tmp_path, monkeypatch):
+        calls = []
+
+        def get_tap_data(table, columns, where):
+            calls.append(columns)
+            return pd.DataFrame({"kepid": [8113154]})
+
+        monkeypatch.setattr(astro_data, "get_tap_data", get_tap_data)
+        filename = tmp_path / "my_file.parquet"
+        df = astro_data.read_kepler_data(
+            "q1_q17_dr25_stellar",
+            {"kepid": "Kepler ID", "teff": "Teff"},
+            "kepid=8113154",
+            filename,
+            projection=["kepid"],
+        )
+        assert calls == [{"kepid": "Kepler ID"}]
+        assert df.equals(pd.DataFrame({"Kepler ID": [8113154]}))
+
+    def test_categorize_columns(self):
+        dispositions = ["CONFIRMED", "CANDIDATE", "CONFIRMED"]
+        df = pd.DataFrame({"kepid": [1, 2, 3], "koi_disposition": dispositions})
+        df = astro_data.categorize_columns(df)
+        assert df["kepid"].dtype == "int64"
+        assert df["koi_disposition"].dtype == "category"
+        assert df["koi_disposition"].tolist() == dispositions
+
+    def test_query_kepler_data_kepid(self, tmp_path, monkeypatch):
+        calls = []
+
+        def get_tap_data(table, columns, where):
+            calls.append(where)
+            return pd.DataFrame({"kepid": [1, 2, 2], "teff": [5000, 6000, 6000]})
+
+        monkeypatch.setattr(astro_data, "CACHE_DIR", str(tmp_path))
+        monkeypatch.setattr(astro_data, "get_tap_data", get_tap_data)
+        astro_data.clear_cache()
+        astro_data.query_kepler_data("cumulative", ["kepid", "teff"], None)
+        df = astro_data.query_kepler_data("cumulative", ["teff"], "kepid=2")
+        assert calls == [None]
+        assert df.equals(pd.DataFrame({"teff": [6000, 6000]}))
+        astro_data.query_kepler_data("cumulative", ["teff"], "kepid=3")
+        astro_data.query_kepler_data("q1_q17_dr25_stellar", ["teff"], "kepid=2")
+        assert calls == [None, "kepid=3", "kepid=2"]
+        astro_data.clear_cache()
+
+    def test_query_kepler_data_backend(self, tmp_path, monkeypatch):
+        def get_tap_data(table, columns, where):
+            return pd.DataFrame({"kepid": [1], "st_quarters": ["0111"]})
+
+        def get_kepler_data(table, columns, where):
+            return astropy.table.QTable({"kepid": [1], "st_quarters": [111]})
+
+        monkeypatch.setattr(astro_data, "CACHE_DIR", str(tmp_path))
+        monkeypatch.setattr(astro_data, "get_tap_data", get_tap_data)
+        monkeypatch.setattr(astro_data, "get_kepler_data", get_kepler_data)
+        astro_data.clear_cache()
+        columns = ["kepid", "st_quarters"]
+        astro_data.query_kepler_data("q1_q17_dr25_stellar", columns, None)
+        df = astro_data.query_kepler_data(
+            "q1_q17_dr25_stellar", columns, "kepid=1", backend="astropy"
+        )
+        assert df["st_quarters"].tolist() == [111]
+        astro_data.clear_cache()
+        df = astro_data.query_kepler_data(
+            "q1_q17_dr25_stellar", columns, None, backend="astropy"
+        )
+        assert df["st_quarters"].tolist() == [111]
+        astro_data.clear_cache()
+
+    def test_query_kepler_data_kepid_filtered(self, tmp_path, monkeypatch):
+        calls = []
+
+        def get_tap_data(table, columns, where):
+            calls.append(where)
+            if where == "koi_disposition='CONFIRMED'":
+                return pd.DataFrame({"kepid": [7], "kepoi_name": ["K1.01"]})
+            if where == "kepid in (7,8)":
+                return pd.DataFrame({"kepid": [7, 8], "kepoi_name": ["K1.01", "K2.01"]})
+            return pd.DataFrame({"kepid": [7, 7], "kepoi_name": ["K1.01", "K1.02"]})
+
+        monkeypatch.setattr(astro_data, "CACHE_DIR", str(tmp_path))
+        monkeypatch.setattr(astro_data, "get_tap_data", get_tap_data)
+        astro_data.clear_cache()
+        columns = ["kepid", "kepoi_name"]
+        confirmed = "koi_disposition='CONFIRMED'"
+        astro_data.query_kepler_data("cumulative", columns, confirmed)
+        df = astro_data.query_kepler_data("cumulative", columns, "kepid=7")
+        assert calls == [confirmed, "kepid=7"]
+        assert df["kepoi_name"].tolist() == ["K1.01", "K1.02"]
+        astro_data.query_kepler_data("cumulative", columns, "kepid in (7,8)")
+        df = astro_data.query_kepler_data("cumulative", columns, "kepid=8")
+        assert calls == [confirmed, "kepid=7", "kepid in (7,8)"]
+        assert df["kepoi_name"].tolist() == ["K2.01"]
+        astro_data.clear_cache()
+
+    def test_get_cache_filename(self):
+        filename = astro_data.get_cache_filename(
+            "q1_q17_dr25_stellar", {"kepid": "Kepler ID"}, "kepid=8113154"
+        )
+        assert filename.startswith(astro_data.CACHE_DIR)
+        assert filename.endswith(".parquet")
+        assert filename == astro_data.get_cache_filename(
+            "q1_q17_dr25_stellar", ["kepid"], "kepid=8113154"
+        )
+        assert filename != astro_data.get_cache_filename(
+            "q1_q17_dr25_stellar", ["kepid"], "kepid=12345"
+        )
+        assert filename != astro_data.get_cache_filename(
+            "q1_q17_dr25_stellar", ["kepid"], "kepid=8113154", backend="astropy"
+        )
+
+    def test_query_kepler_data_cache(self, tmp_path, monkeypatch):
+        calls = []
+
+        def get_kepler_data(table, columns, where):
+            calls.append((table, columns, where))
+            return astropy.table.Table({"kepid": [8113154]})
+
+        monkeypatch.setattr(astro_data, "CACHE_DIR", str(tmp_path))
+        monkeypatch.setattr(astro_data, "get_kepler_data", get_kepler_data)
+        astro_data.clear_cache()
+        df = astro_data.query_kepler_data(
+            "q1_q17_dr25_stellar", ["kepid"], "kepid=1", backend="astropy"
+        )
+        cached_df = astro_data.query_kepler_data(
+            "q1_q17_dr25_stellar", ["kepid"], "kepid=1", backend="astropy"
+        )
+        assert len(calls) == 1
+        assert len(os.listdir(tmp_path)) == 1
+        assert cached_df.equals(df)
+        astro_data.query_kepler_data(
+            "q1_q17_dr25_stellar", ["kepid"], "kepid=1", cache=False, backend="astropy"
+        )
+        assert len(calls) == 2
+        astro_data.clear_cache()
+
+    def test_query_kepler_data_invalid_cache(self, tmp_path, monkeypatch):
+        def get_tap_data(table, columns, where):
+            return pd.DataFrame({"kepid": [1]})
+
+        monkeypatch.setattr(astro_data, "CACHE_DIR", str(tmp_path))
+        monkeypatch.setattr(astro_data, "get_tap_data", get_tap_data)
+        astro_data.clear_cache()
+        cache_filename = astro_data.get_cache_filename("cumulative", ["kepid"], None)
+        with open(cache_filename, "wb") as cache_file:
+            cache_file.write(b"PAR1 truncated")
+        assert astro_data.read_cache(cache_filename) is None
+        assert os.listdir(tmp_path) == []
+        df = astro_data.query_kepler_data("cumulative", ["kepid"], None)
+        assert df["kepid"].tolist() == [1]
+        assert os.listdir(tmp_path) == [os.path.basename(cache_filename)]
+        assert astro_data.read_cache(cache_filename).equals(df)
+        astro_data.clear_cache()
+
+    def test_query_kepler_data_unwritable_cache(self, tmp_path, monkeypatch):
+        def get_tap_data(table, columns, where):
+            return pd.DataFrame({"kepid": [8113154]})
+
+        cache_file = tmp_path / "cache"
+        cache_file.write_text("")
+        monkeypatch.setattr(astro_data, "CACHE_DIR", str(cache_file / "exoplanets"))
+        monkeypatch.setattr(astro_data, "get_tap_data", get_tap_data)
+        astro_data.clear_cache()
+        df = astro_data.query_kepler_data("q1_q17_dr25_stellar", ["kepid"], None)
+        assert df["kepid"].tolist() == [8113154]
+        assert [path.name for path in tmp_path.iterdir()] == ["cache"]
+        astro_data.clear_cache()
+
+    def test_query_kepler_data_memory_cache(self, tmp_path, monkeypatch):
+        calls = []
+
+        def get_tap_data(table, columns, where):
+            calls.append(where)
+            return pd.DataFrame({"kepid": [int(where.split("=")[1])]})
+
+        monkeypatch.setattr(astro_data, "CACHE_DIR", str(tmp_path))
+        monkeypatch.setattr(astro_data, "MEMORY_CACHE_SIZE", 2)
+        monkeypatch.setattr(astro_data, "get_tap_data", get_tap_data)
+        astro_data.clear_cache()
+        df = astro_data.query_kepler_data("q1_q17_dr25_stellar", ["kepid"], "kepid=1")
+        df["kepid"] = 0
+        for tmp_file in tmp_path.iterdir():
+            tmp_file.unlink()
+        df = astro_data.query_kepler_data("q1_q17_dr25_stellar", ["kepid"], "kepid=1")
+        assert calls == ["kepid=1"]
+        assert df["kepid"].tolist() == [1]
+        astro_data.query_kepler_data("q1_q17_dr25_stellar", ["kepid"], "kepid=2")
+        astro_data.query_kepler_data("q1_q17_dr25_stellar", ["kepid"], "kepid=3")
+        for tmp_file in tmp_path.iterdir():
+            tmp_file.unlink()
+        astro_data.query_kepler_data("q1_q17_dr25_stellar", ["kepid"], "kepid=1")
+        assert calls == ["kepid=1", "kepid=2", "kepid=3", "kepid=1"]
+        astro_data.clear_cache()
+
+    def test_get_adql_query(self):
+        query = astro_data.get_adql_query(
+            "q1_q17_dr25_stellar", {"kepid": "Kepler ID", "teff": "Teff"}, "kepid=1"
+        )
+        assert query == "select kepid,teff from q1_q17_dr25_stellar where kepid=1"
+        query = astro_data.get_adql_query("cumulative", ["*"], None)
+        assert query == "select * from cumulative"
+
+    def test_get_tap_data(self):
+        df = astro_data.get_tap_data(
+            table="q1_q17_dr25_stellar",
+            columns=["kepid", "tm_designation"],
+            where="kepid=8113154",
+        )
+        expected_df = pd.DataFrame(
+            {"kepid": [8113154], "tm_designation": "2MASS J19473063+4356298"}
+        )
+        assert df.equals(expected_df)
+
+    def test_table_to_pandas(self):
+        kepler_data = astropy.table.QTable(
+            {
+                "kepid": [1, 2, 3],
+                "nkoi": astropy.table.MaskedColumn([1, 2, 3], mask=[0, 1, 0]),
+                "teff": astropy.table.MaskedColumn([5.0, 6.0, 7.0], mask=[1, 0, 0]),
+                "tm_designation": ["a", "b", "c"],
+            }
+        )
+        df = astro_data.table_to_pandas(kepler_data)
+        expected_df = pd.DataFrame(
+            {
+                "kepid": [1, 2, 3],
+                "nkoi": [1.0, None, 3.0],
+                "teff": [None, 6.0, 7.0],
+                "tm_designation": ["a", "b", "c"],
+            }
+        )
+        assert df.equals(expected_df)
+        assert kepler_data["teff"].data.data[0] == 5.0
+
+    def test_get_tap_data_response(self, monkeypatch):
+        data = b"kepid,koi_score,kepler_name\n1,0.5,\n2,,Kepler-1 b\n"
+        queries = []
+
+        def get(url, params, stream, timeout):
+            queries.append(params)
+            assert timeout == astro_data.TAP_TIMEOUT
+            return FakeResponse(data)
+
+        monkeypatch.setattr(astro_data._session, "get", get)
+        df = astro_data.get_tap_data(
+            "cumulative", ["kepid", "koi_score", "kepler_name"], "kepid<3"
+        )
+        assert queries == [
+            {
+                "query": "select kepid,koi_score,kepler_name from cumulative "
+                "where kepid<3",
+                "format": "csv",
+            }
+        ]
+        assert df["kepid"].tolist() == [1, 2]
+        assert df["koi_score"].fillna(-1).tolist() == [0.5, -1]
+        assert df["kepler_name"].fillna("").tolist() == ["", "Kepler-1 b"]
+
+    def test_get_tap_data_string_columns(self, monkeypatch):
+        data = (
+            b"kepid,st_quarters,koi_quarters,st_vet_date\n"
+            b"1,01111111111111111,00000000000000011111111111111111,2017-02-28\n"
+        )
+        monkeypatch.setattr(
+            astro_data._session, "get", lambda *a, **k: FakeResponse(data)
+        )
+        df = astro_data.get_tap_data("cumulative", ["*"], None)
+        assert df["st_quarters"].tolist() == ["01111111111111111"]
+        assert df["koi_quarters"].tolist() == ["00000000000000011111111111111111"]
+        assert df["st_vet_date"].tolist() == ["2017-02-28"]
+
     def test_rename_columns(self):
-        df = pd.DataFrame({"A": [1, 2, 3]})
-        df = astro_data.rename_columns(df, columns={"A": "B"})
-        expected_df = pd.DataFrame({"B": [1, 2, 3]})
+        df = pd.DataFrame({"A": [1, 2, 3], "C": [4, 5, 6]})
+        renamed_df = astro_data.rename_columns(df, columns={"A": "B"})
+        expected_df = pd.DataFrame({"B": [1, 2, 3], "C": [4, 5, 6]})
+        assert renamed_df is df
         assert df.equals(expected_df)
 
     def test_rename_columns_list(self):
@@ -49,13 +381,51 @@ class TestAstroDataTable:
         df = astro_data.rename_columns(df, columns=["A"])
         assert df.equals(expected_df)
 
-    def test_record_dataframe(self, tmp_path):
+    def test_record_dataframe(self, tmp_path, caplog):
         filename = tmp_path / "my_file.csv"
         df = pd.DataFrame({"A": [1, 2, 3]})
         astro_data.record_dataframe(df, filename=filename)
         with open(filename, "r") as csv_file:
             csv_contents = csv_file.read()
         assert csv_contents == "A\n1\n2\n3\n"
+        assert "deprecated" in caplog.text
+
+    def test_record_dataframe_current_directory(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        df = pd.DataFrame({"A": [1, 2, 3]})
+        astro_data.record_dataframe(df, filename="my_file.parquet")
+        assert pd.read_parquet(tmp_path / "my_file.parquet").equals(df)
+
+    def test_record_dataframe_parquet(self, tmp_path):
+        filename = tmp_path / "data" / "my_file.parquet"
+        df = pd.DataFrame({"A": [1, 2, 3], "B": ["x", "y", "z"]})
+        astro_data.record_dataframe(df, filename=filename)
+        assert pd.read_parquet(filename).equals(df)
+        assert astro_data.read_dataframe(filename).equals(df)
+
+    def test_record_dataframe_hdf(self, tmp_path):
+        pytest.importorskip("tables")
+        df = pd.DataFrame({"A": [1, 2, 3], "B": ["x", "y", "z"]})
+        for filename in [tmp_path / "my_file.h5", tmp_path / "my_file.hdf5"]:
+            astro_data.record_dataframe(df, filename=filename)
+            assert pd.read_hdf(filename, key="kepler").equals(df)
+            assert astro_data.read_dataframe(filename).equals(df)
+            assert astro_data.read_dataframe(filename, columns=["B"]).equals(df[["B"]])
+
+    def test_record_dataframe_arrow(self, tmp_path):
+        df = pd.DataFrame({"A": [1, 2, 3], "B": ["x", "y", "z"]})
+        for filename in [tmp_path / "my_file.feather", tmp_path / "my_file.arrow"]:
+            astro_data.record_dataframe(df, filename=filename)
+            assert pd.read_feather(filename).equals(df)
+            assert astro_data.read_dataframe(filename, columns=["B"]).equals(df[["B"]])
+
+    def test_get_file_format(self):
+        assert astro_data.get_file_format("data/stars.parquet") == "parquet"
+        assert astro_data.get_file_format("data/stars.H5") == "hdf"
+        assert astro_data.get_file_format("data/stars.hdf5") == "hdf"
+        assert astro_data.get_file_format("data/stars.feather") == "feather"
+        assert astro_data.get_file_format("data/stars.arrow") == "arrow"
+        assert astro_data.get_file_format("data/stars.csv") == "csv"
 
     def test_read_kepler_data(self, tmp_path):
         filename = tmp_path / "my_file.csv"
@@ -85,6 +455,107 @@ class TestAstroDataTable:
         expected_df = pd.DataFrame({"A": [1, 2, 3]})
         assert df.equals(expected_df)
 
+    def test_read_kepler_data_stream_from_file(self, tmp_path):
+        filename = tmp_path / "my_file.csv"
+        pd.DataFrame({"A": [1, 2, 3]}).to_csv(filename, index=False)
+        chunks = astro_data.read_kepler_data(
+            table="q1_q17_dr25_stellar",
+            columns=["kepid"],
+            where="filter",
+            filename=filename,
+            stream=True,
+        )
+        assert [chunk["A"].tolist() for chunk in chunks] == [[1, 2, 3]]
+
+    def test_read_many_kepler_data(self, monkeypatch):
+        def read_kepler_data(table, where=None):
+            return pd.DataFrame({"table": [table], "where": [where]})
+
+        monkeypatch.setattr(astro_data, "read_kepler_data", read_kepler_data)
+        dfs = astro_data.read_many_kepler_data(
+            [{"table": "cumulative"}, {"table": "q1_q17_dr25_stellar", "where": "w"}]
+        )
+        assert list(dfs) == ["cumulative", "q1_q17_dr25_stellar"]
+        assert dfs["cumulative"]["table"].tolist() == ["cumulative"]
+        assert dfs["q1_q17_dr25_stellar"]["where"].tolist() == ["w"]
+
+    def test_read_many_kepler_data_same_table(self):
+        with pytest.raises(ValueError):
+            astro_data.read_many_kepler_data(
+                [
+                    {"table": "cumulative", "where": "a"},
+                    {"table": "cumulative", "where": "b"},
+                ]
+            )
+
+    def test_iter_kepler_data(self, tmp_path, monkeypatch):
+        def iter_tap_data(table, columns, where, chunksize):
+            assert chunksize == 2
+            yield pd.DataFrame({"kepid": [1, 2], "teff": [5000, 6000]})
+            yield pd.DataFrame({"kepid": [3], "teff": [7000]})
+
+        monkeypatch.setattr(astro_data, "CACHE_DIR", str(tmp_path))
+        monkeypatch.setattr(astro_data, "iter_tap_data", iter_tap_data)
+        astro_data.clear_cache()
+        chunks = astro_data.iter_kepler_data(
+            "q1_q17_dr25_stellar",
+            {"kepid": "Kepler ID", "teff": "Teff"},
+            "kepid<4",
+            chunksize=2,
+        )
+        chunks = list(chunks)
+        assert len(chunks) == 2
+        assert all(chunk.columns.tolist() == ["Kepler ID", "Teff"] for chunk in chunks)
+        assert [chunk["Teff"].tolist() for chunk in chunks] == [[5000, 6000], [7000]]
+        assert os.listdir(tmp_path) == []
+
+    def test_iter_tap_data(self, monkeypatch):
+        data = b"kepid,koi_disposition\n" + b"".join(
+            b"%d,CONFIRMED\n" % kepid for kepid in range(10000)
+        )
+        monkeypatch.setattr(astro_data, "STREAM_BLOCK_SIZE", 1 << 12)
+        monkeypatch.setattr(
+            astro_data._session, "get", lambda *a, **k: FakeResponse(data)
+        )
+        chunks = list(astro_data.iter_tap_data("cumulative", ["*"], None, 3000))
+        assert len(chunks) > 1
+        assert all(len(chunk) >= 3000 for chunk in chunks[:-1])
+        assert pd.concat(chunks)["kepid"].tolist() == list(range(10000))
+        assert chunks[0]["koi_disposition"].dtype == "category"
+
+    def test_iter_tap_data_type_change(self, monkeypatch):
+        data = (
+            b"kepid,koi_score\n"
+            + b"".join(b"%d,1\n" % kepid for kepid in range(5000))
+            + b"5000,0.5\n"
+        )
+
+        monkeypatch.setattr(astro_data, "STREAM_BLOCK_SIZE", 1 << 12)
+        monkeypatch.setattr(
+            astro_data._session, "get", lambda *a, **k: FakeResponse(data)
+        )
+        chunks = list(astro_data.iter_tap_data("cumulative", ["*"], None, 10000))
+        df = pd.concat(chunks)
+        assert df["kepid"].tolist() == list(range(5001))
+        assert df["koi_score"].tolist() == [1] * 5000 + [0.5]
+        with pytest.raises(ValueError):
+            list(astro_data.iter_tap_data("cumulative", ["*"], None, 1000))
+
+    def test_iter_dataframe_parquet(self, tmp_path):
+        filename = tmp_path / "my_file.parquet"
+        pd.DataFrame({"A": [1, 2, 3], "B": [4, 5, 6]}).to_parquet(filename)
+        chunks = list(astro_data.iter_dataframe(filename, chunksize=2, columns=["A"]))
+        assert [chunk.to_dict("list") for chunk in chunks] == [
+            {"A": [1, 2]},
+            {"A": [3]},
+        ]
+
+    def test_iter_dataframe(self, tmp_path):
+        filename = tmp_path / "my_file.csv"
+        pd.DataFrame({"A": [1, 2, 3]}).to_csv(filename, index=False)
+        chunks = list(astro_data.iter_dataframe(filename, chunksize=2))
+        assert [chunk["A"].tolist() for chunk in chunks] == [[1, 2], [3]]
+
     def test_download_light_curves(self, tmp_path):
         targets = [8113154]
         download_dir = tmp_path / "mastDownload/Kepler"